@@ -34,13 +34,17 @@ class PlainBackend:
 
     color_count = 1
     name = "plain"
+    _plain_triplet = None  # Plain renderables don't depend on backend state, they're built once and shared
 
     def __repr__(self):
         return self.name
 
     def named_triplet(self):
         """Triplet of named bg, fg and style-s"""
-        return NamedColors(), NamedColors(), NamedStyles()
+        if PlainBackend._plain_triplet is None:
+            PlainBackend._plain_triplet = NamedColors(), NamedColors(), NamedStyles()
+
+        return PlainBackend._plain_triplet
 
     @staticmethod
     def adjusted_size(text, size=0):
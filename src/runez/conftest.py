@@ -6,6 +6,7 @@ Example:
     from runez.conftest import cli, isolated_log_setup, temp_folder
 """
 
+import functools
 import logging
 import os
 import re
@@ -20,7 +21,7 @@ from runez.colors import ActivateColors
 from runez.file import TempFolder
 from runez.logsetup import LogManager
 from runez.render import Header
-from runez.system import _R, CaptureOutput, DEV, Slotted, TempArgv, TrackedOutput
+from runez.system import _R, CaptureOutput, DEV, TempArgv, TrackedOutput
 from runez.system import flattened, LOG, quoted, short, stringified, UNSET
 
 try:
@@ -219,6 +220,14 @@ class WrappedHandler(_pytest.logging.LogCaptureHandler):
         cls._current_instance = super().__new__(cls)
         return cls._current_instance
 
+    def __init__(self, *_):
+        if getattr(self, "records", None) is not None:
+            # Constructed again by pytest: no need to re-initialize the whole handler, resetting accumulated logs suffices
+            self.reset()
+            return
+
+        super().__init__()
+
     @classmethod
     def count_non_wrapped_handlers(cls):
         return len([h for h in logging.root.handlers if not isinstance(h, cls)])
@@ -228,9 +237,7 @@ class WrappedHandler(_pytest.logging.LogCaptureHandler):
             stream = CaptureOutput.current_capture_buffer()
             if stream is not None:
                 try:
-                    msg = self.format(record)
-                    stream.write(msg + "\n")
-                    self.flush()
+                    stream.write(self.format(record) + "\n")  # CaptureBuffer: accumulates chunks, joined only on read
 
                 except Exception:  # pragma: no cover
                     self.handleError(record)
@@ -325,11 +332,16 @@ class ClickRunner:
             trace (bool): If True, enable trace logging
         """
         main = _R.rdefault(main, self.main or cli.default_main)
-        if len(args) == 1 and hasattr(args[0], "split"):
+        if len(args) == 1 and isinstance(args[0], str):
             # Convenience: allow to provide full command as one string argument
             args = args[0].split()
 
-        self.args = flattened(args, shellify=True)
+        if all(isinstance(a, str) for a in args):
+            self.args = list(args)  # Common case: already flat, and flattened() would keep all strings as-is
+
+        else:
+            self.args = flattened(args, shellify=True)
+
         with IsolatedLogSetup(adjust_tmp=False):
             with CaptureOutput(dryrun=_R.is_dryrun(), seed_logging=True, trace=_R.rdefault(trace, self.trace)) as logged:
                 self.logged = logged
@@ -355,8 +367,9 @@ class ClickRunner:
 
         if self.logged:
             WrappedHandler.clean_accumulated_logs()
-            title = Header.aerated("Captured output for: %s" % quoted(self.args), border="==")
-            LOG.info("\n%s\nmain: %s\nexit_code: %s\n%s\n", title, main, self.exit_code, self.logged)
+            if LOG.isEnabledFor(logging.INFO):
+                title = Header.aerated("Captured output for: %s" % quoted(self.args), border="==")
+                LOG.info("\n%s\nmain: %s\nexit_code: %s\n%s\n", title, main, self.exit_code, self.logged)
 
     @property
     def succeeded(self):
@@ -377,80 +390,118 @@ class ClickRunner:
         Returns:
             (Match | None): Match found, if any
         """
-        if stdout is None and stderr is None:
-            # By default, look at stdout/stderr only
-            stdout = stderr = True
-
         assert expected, "No 'expected' provided"
+        is_str = isinstance(expected, str)
         assert self.exit_code is not None, "run() was not called yet"
 
-        captures = [stdout and self.logged.stdout, stderr and self.logged.stderr]
-        captures = [c for c in captures if c is not None and c is not False]
-
+        captures = self._selected_captures(stdout, stderr)
         assert captures, "No captures specified"
-        if not any(c for c in captures):
+        if not any(captures):
             # There was no output at all
             return None
 
-        if not isinstance(regex, bool) and isinstance(regex, int):
-            flags = regex
-            regex = True
-
-        else:
-            flags = 0
+        flags = 0
+        ellipsis = False
+        if regex is not True and regex is not False:
+            if isinstance(regex, int):
+                flags = regex
+                regex = True
 
-        if isinstance(expected, str) and "..." in expected and not isinstance(regex, bool):
-            regex = True
-            expected = expected.replace("...", ".+")
+            elif is_str and "..." in expected:
+                regex = ellipsis = True
 
-        if not isinstance(expected, str):
+        if not is_str:
             # Assume regex, no easy way to verify isinstance(expected, re.Pattern) for python < 3.7
             regex = expected
 
         elif regex:
-            regex = re.compile("(.{0,32})(%s)(.{0,32})" % expected, flags=flags)
+            regex = _compiled_match(expected, flags, ellipsis)
 
         for c in captures:
             contents = c.contents()
             if regex:
                 m = regex.search(contents)
                 if m:
+                    if is_str:
+                        # Up to 32 chars of context around the match, as would be matched by '.{0,32}' with the same flags
+                        start, end = m.span()
+                        pre = contents[max(0, start - 32):start]
+                        post = contents[end:end + 32]
+                        if not regex.flags & re.DOTALL:
+                            pre = pre.rpartition("\n")[2]  # '.' does not match newlines, context stays on the same line
+                            post = post.partition("\n")[0]
+
+                        return Match(c, m.group(0), pre=pre, post=post)
+
                     if m.groups():
                         return Match(c, m.group(2), pre=m.group(1), post=m.group(3))
 
                     return Match(c, m.group(0))
 
-            elif expected in contents:
-                i = contents.index(expected)
-                pre = short(contents[:i], size=32)
-                post = short(contents[i + len(expected):], size=32)
-                return Match(c, expected, pre=pre, post=post)
+            else:
+                i = contents.find(expected)
+                if i >= 0:
+                    pre = short(contents[:i], size=32)
+                    post = short(contents[i + len(expected):], size=32)
+                    return Match(c, expected, pre=pre, post=post)
 
     def expect_messages(self, *expected, **kwargs):
+        seen = self._seen_literals(expected, **kwargs)
         for message in expected:
             if message[0] == "!":
                 m = self.match(message[1:], **kwargs)
                 if m:
                     assert False, "Unexpected match in output: %s" % m
 
-            else:
+            elif message not in seen:
                 m = self.match(message, **kwargs)
                 if not m:
                     assert False, "Not seen in output: %s" % message
 
     def expect_success(self, args, *expected, **kwargs):
-        spec = RunSpec()
-        spec.pop(kwargs)
+        spec = _popped_run_spec(kwargs)
         self.run(args, **kwargs)
         assert self.succeeded, "%s failed, was expecting success" % quoted(self.args)
-        self.expect_messages(*expected, **spec.to_dict())
+        self.expect_messages(*expected, **spec)
 
     def expect_failure(self, args, *expected, **kwargs):
-        spec = RunSpec()
-        spec.pop(kwargs)
+        spec = _popped_run_spec(kwargs)
         self.run(args, **kwargs)
         assert self.failed, "%s succeeded, was expecting failure" % quoted(self.args)
-        self.expect_messages(*expected, **spec.to_dict())
+        self.expect_messages(*expected, **spec)
+
+    def _seen_literals(self, expected, stdout=None, stderr=None, regex=None):
+        """
+        Args:
+            expected (tuple): Messages passed to expect_messages()
+            stdout (bool | None): Look at stdout (default: yes, if captured)
+            stderr (bool | None): Look at stderr (default: yes, if captured)
+            regex (int | bool | None): Specify whether 'expected' should be a regex
+
+        Returns:
+            (set): Plain-text (non-regex) expected messages seen in output, found via one scan of each capture
+        """
+        if self.logged is None or (regex is not None and regex is not False):
+            return set()
+
+        literals = set(m for m in expected if m and m[0] != "!" and (regex is False or "..." not in m))
+        if len(literals) < 2:
+            return set()  # Nothing to gain compared to a regular match()
+
+        # Longest first, so that messages that are a prefix of another one don't shadow it
+        rx = _compiled_match("|".join(re.escape(m) for m in sorted(literals, key=len, reverse=True)), 0, False)
+        seen = set()
+        for c in self._selected_captures(stdout, stderr):
+            seen.update(m.group(0) for m in rx.finditer(c.contents()))
+
+        return seen  # Overlapping messages may remain unseen here, they're then verified individually via match()
+
+    def _selected_captures(self, stdout, stderr):
+        if stdout is None and stderr is None:
+            # By default, look at stdout/stderr only
+            stdout = stderr = True
+
+        return [c for c in (stdout and self.logged.stdout, stderr and self.logged.stderr) if c is not None and c is not False]
 
     def _resolved_script(self, script):
         if script.startswith("-") or os.path.exists(script):
@@ -509,15 +560,10 @@ class ClickRunner:
         assert False, "Can't invoke invalid main: %s" % main
 
 
-class RunSpec(Slotted):
-
-    __slots__ = ["stdout", "stderr", "regex"]
-
-    def _get_defaults(self):
-        return UNSET
+class Match:
 
+    __slots__ = ["capture", "match", "pre", "post"]
 
-class Match:
     def __init__(self, capture, match, pre=None, post=None):
         self.capture = capture
         self.match = match
@@ -526,3 +572,23 @@ class Match:
 
     def __repr__(self):
         return self.match
+
+
+def _popped_run_spec(kwargs):
+    """dict: Settings applicable to `ClickRunner.expect_messages()`, popped from 'kwargs'"""
+    spec = {}
+    for name in ("stdout", "stderr", "regex"):
+        value = kwargs.pop(name, UNSET)
+        if value is not UNSET:
+            spec[name] = value
+
+    return spec
+
+
+@functools.lru_cache(maxsize=512)
+def _compiled_match(expected, flags, ellipsis):
+    """Compiled regex used by ClickRunner.match(), tests tend to look for the same 'expected' messages repeatedly"""
+    if ellipsis:
+        expected = expected.replace("...", ".+")  # '...' is a shorthand for '.+'
+
+    return re.compile(expected, flags=flags)
@@ -6,7 +6,7 @@ import pathlib
 import re
 from collections import defaultdict
 
-from runez.system import _R, flattened, joined, stringified
+from runez.system import _R, joined, stringified
 
 
 def parsed_tabular(content):
@@ -128,6 +128,9 @@ def to_float(value, lenient=False, default=None):
     if isinstance(value, str):
         return _float_from_text(value, lenient=lenient, default=default)
 
+    if type(value) is float and not lenient:
+        return value
+
     if lenient:
         try:
             return int(value)
@@ -154,6 +157,9 @@ def to_int(value, default=None):
     if isinstance(value, str):
         return _int_from_text(value, default=default)
 
+    if type(value) is int:  # bool is deliberately not short-circuited, int() turns it into a plain 0 or 1
+        return value
+
     try:
         return int(value)
 
@@ -334,10 +340,11 @@ def words(text, normalize=None, split="_", decamel=False):
 
         return result
 
+    # Pieces split out by `rx_words` are made of word characters only, no need to strip() them
     strings = _R.lc.rx_words.split(stringified(text))
-    strings = flattened(strings, split=split, strip=True)
+    strings = [s for piece in strings for s in (piece.split(split) if split else (piece,)) if s]
     if decamel:
-        strings = flattened(_R.lc.rx_camel_cased_words.findall(s) for s in strings)
+        strings = [s for piece in strings for s in _R.lc.rx_camel_cased_words.findall(piece)]
 
     if normalize:
         strings = [normalize(s) for s in strings]
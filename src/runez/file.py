@@ -2,11 +2,15 @@ import hashlib
 import io
 import os
 import shutil
+import stat
 import tempfile
 import time
 from pathlib import Path
 
-from runez.system import _R, abort, Anchored, decode, flattened, resolved_path, short, SYMBOLIC_TMP, SYS_INFO, UNSET
+from runez.system import _R, abort, Anchored, flattened, resolved_path, short, SYMBOLIC_TMP, SYS_INFO, UNSET
+
+
+SMALL_FILE_SIZE = 65536  # Files up to this size are read in one go by readlines()
 
 
 def basename(path, extension_marker=os.extsep, follow=False):
@@ -88,16 +92,16 @@ def delete(path, fatal=True, logger=UNSET, dryrun=UNSET):
         (int): In non-fatal mode, 1: successfully done, 0: was no-op, -1: failed
     """
     path = resolved_path(path)
-    islink = path and os.path.islink(path)
-    if not islink and (not path or not os.path.exists(path)):
+    unlinkable = _unlinkable(path)
+    if unlinkable is None:
         return 0
 
     if _R.hdry(dryrun, logger, "delete %s" % short(path)):
         return 1
 
     try:
-        _do_delete(path, islink, fatal)
-        _R.hlog(logger, "Deleted %s" % short(path))
+        _do_delete(path, unlinkable, fatal)
+        _R.hlog(logger, lambda: "Deleted %s" % short(path))
         return 1
 
     except Exception as e:
@@ -141,7 +145,7 @@ def ensure_folder(path, clean=False, fatal=True, logger=UNSET, dryrun=UNSET):
 
     try:
         os.makedirs(path)
-        _R.hlog(logger, "Created folder %s" % short(path))
+        _R.hlog(logger, lambda: "Created folder %s" % short(path))
 
         return 1
 
@@ -293,15 +297,22 @@ def readlines(path, first=None, errors="ignore", fatal=False, logger=False, tran
         (str): Lines read, newlines and trailing spaces stripped
     """
     try:
-        with io.open(resolved_path(path), errors=errors) as fh:
+        with io.open(resolved_path(path), "rb", buffering=0) as fh:
+            st = os.fstat(fh.fileno())
+            if stat.S_ISREG(st.st_mode) and st.st_size <= SMALL_FILE_SIZE:
+                # Small regular file: read it in one go, and split it in one go as well (FIFOs, devices etc. are streamed)
+                lines = _split_lines(fh.read().decode("utf-8", errors or "strict"))
+
+            else:
+                lines = io.TextIOWrapper(io.BufferedReader(fh), encoding="utf-8", errors=errors)
+
             if not first:
                 first = -1
 
-            for line in fh:
+            for line in lines:
                 if first == 0:
                     return
 
-                line = decode(line)
                 if transform:
                     line = transform(line)
                 yield line
@@ -500,7 +511,7 @@ def write(path, contents, fatal=True, logger=UNSET, dryrun=UNSET):
 
     Args:
         path (str | Path | None): Path to file
-        contents (str | bytes | None): Contents to write (only touch file if None)
+        contents (str | bytes | None): Contents to write (only touch file if None, existing file is then left as-is, with updated mtime)
         fatal (type | bool | None): True: abort execution on failure, False: don't abort but log, None: don't abort, don't log
         logger (callable | bool | None): Logger to use, True to print(), False to trace(), None to disable log chatter
         dryrun (bool | UNSET | None): Optionally override current dryrun setting
@@ -512,48 +523,59 @@ def write(path, contents, fatal=True, logger=UNSET, dryrun=UNSET):
         return 0
 
     path = resolved_path(path)
-    short_path = short(path)
-    if _R.hdry(dryrun, logger, "%s %s" % ("write" if contents else "touch", short_path)):
+    if _R.hdry(dryrun, logger, lambda: "%s %s" % ("write" if contents else "touch", short(path))):
         return 1
 
-    ensure_folder(parent_folder(path), fatal=fatal, logger=None, dryrun=dryrun)
+    existing = contents is None and os.path.isfile(path)  # Touching an existing file only needs its mtime updated
+    if not existing:
+        ensure_folder(parent_folder(path), fatal=fatal, logger=None, dryrun=dryrun)
+
     try:
-        mode = "wb" if isinstance(contents, bytes) else "wt"
-        with io.open(path, mode) as fh:
-            if contents is None:
+        if existing:
+            os.utime(path, None)
+            _R.hlog(logger, lambda: "Touched %s" % short(path))
+            return 1
+
+        data = contents.encode("utf-8") if isinstance(contents, str) else contents
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            if data is None:
                 os.utime(path, None)
 
             else:
-                fh.write(contents)
+                _write_fully(fd, data)
 
-        _R.hlog(logger, "%s %s" % ("Wrote" if contents else "Touched", short_path))
+        finally:
+            os.close(fd)
+
+        _R.hlog(logger, lambda: "%s %s" % ("Wrote" if contents else "Touched", short(path)))
         return 1
 
     except Exception as e:
-        return abort("Can't write to %s" % short_path, exc_info=e, return_value=-1, fatal=fatal, logger=logger)
+        return abort("Can't write to %s" % short(path), exc_info=e, return_value=-1, fatal=fatal, logger=logger)
 
 
 def _copy(source, destination, ignore=None):
-    """Effective copy"""
-    if os.path.isdir(source):
-        if os.path.isdir(destination):
-            for fname in os.listdir(source):
-                _copy(os.path.join(source, fname), os.path.join(destination, fname), ignore=ignore)
+    """Effective copy, last modification time is preserved"""
+    if not os.path.isdir(source):
+        shutil.copy2(source, destination)  # Copies contents, then stat (including mode) once
+        return
 
-        else:
-            if os.path.isfile(destination) or os.path.islink(destination):
-                os.unlink(destination)
+    if os.path.isdir(destination):
+        for fname in os.listdir(source):
+            _copy(os.path.join(source, fname), os.path.join(destination, fname), ignore=ignore)
 
-            shutil.copytree(source, destination, symlinks=True, ignore=ignore)
+        shutil.copystat(source, destination)
+        return
 
-    else:
-        shutil.copy(source, destination)
+    if os.path.isfile(destination) or os.path.islink(destination):
+        os.unlink(destination)
 
-    shutil.copystat(source, destination)  # Make sure last modification time is preserved
+    shutil.copytree(source, destination, symlinks=True, ignore=ignore)  # Already copies stat of all folders and files
 
 
-def _do_delete(path, islink, fatal):
-    if islink or os.path.isfile(path):
+def _do_delete(path, unlinkable, fatal):
+    if unlinkable:
         os.unlink(path)
 
     else:
@@ -565,6 +587,22 @@ def _move(source, destination):
     shutil.move(source, destination)
 
 
+def _unlinkable(path):
+    """
+    Args:
+        path (str | None): Path to inspect (not followed if it's a symlink)
+
+    Returns:
+        (bool | None): None if 'path' does not exist, True if it can be unlinked (file or symlink), False if it's a folder
+    """
+    if path:
+        try:
+            return not stat.S_ISDIR(os.lstat(path).st_mode)
+
+        except OSError:
+            return None
+
+
 def _symlink(source, destination):
     """Effective symlink"""
     source = to_path(source)
@@ -578,6 +616,20 @@ def _symlink(source, destination):
     os.symlink(source, destination)
 
 
+def _split_lines(text):
+    """Lines in 'text' (with their trailing newline), splitting on the same universal newlines as text-mode files do"""
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+
+    lines = text.split("\n")
+    last = lines.pop()
+    lines = [line + "\n" for line in lines]
+    if last:
+        lines.append(last)
+
+    return lines
+
+
 def _tar(source, destination, arcname, mode):
     """Effective tar"""
     import tarfile
@@ -633,6 +685,13 @@ def _unzip(source, destination, simplify):
         _move_extracted(extracted_source, destination, simplify)
 
 
+def _write_fully(fd, data):
+    """Write all of 'data' to file descriptor 'fd' (os.write() may write only part of it)"""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
 def _zip(source, destination, arcname, fh=None):
     """Effective zip, behaving like tar+gzip for consistency"""
     if fh is None:
@@ -677,7 +736,7 @@ def _file_op(source, destination, func, overwrite, fatal, logger, dryrun, must_e
     action = func.__name__[1:]
     indicator = "<-" if action == "symlink" else "->"
     description = "%s %s %s %s" % (action, short(source), indicator, short(destination))
-    psource = parent_folder(source)
+    psource = os.path.dirname(resolved_path(source))
     pdest = resolved_path(destination)
     if psource.startswith(pdest):
         message = "Can't %s: source contained in destination" % description
@@ -691,17 +750,17 @@ def _file_op(source, destination, func, overwrite, fatal, logger, dryrun, must_e
         return abort(message, return_value=-1, fatal=fatal, logger=logger)
 
     if overwrite is not None:
-        islink = os.path.islink(pdest)
-        if islink or os.path.exists(pdest):
+        unlinkable = _unlinkable(pdest)
+        if unlinkable is not None:
             if not overwrite:
                 message = "%s exists, can't %s" % (short(destination), action.lower())
                 return abort(message, return_value=-1, fatal=fatal, logger=logger)
 
-            _do_delete(pdest, islink, fatal)
+            _do_delete(pdest, unlinkable, fatal)
 
     try:
         # Ensure parent folder exists
-        ensure_folder(parent_folder(destination), fatal=fatal, logger=None, dryrun=dryrun)
+        ensure_folder(os.path.dirname(pdest), fatal=fatal, logger=None, dryrun=dryrun)
         _R.hlog(logger, "%s%s" % (description[0].upper(), description[1:]))
         if ignore is not None:
             if not callable(ignore):
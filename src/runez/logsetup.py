@@ -42,6 +42,9 @@ def formatted(message, *args, **named_values):
             except TypeError:
                 pass
 
+    if "{" not in message:
+        return message  # Nothing to format(), no need to parse 'message' for placeholders
+
     try:
         return message.format(*args, **named_values)
 
@@ -1013,10 +1016,10 @@ class LogManager:
     def trace(cls, message, *args):
         """
         Args:
-            message (str): Message to trace
+            message (str | callable): Message to trace (called only when tracing is enabled, if callable)
         """
         if cls.tracer or cls.progress.is_running:
-            message = formatted(message, *args)
+            message = formatted(_R.actual_message(message), *args)
             cls.progress._show_debug(message)
             if cls.tracer:
                 cls.tracer.trace(message)
@@ -1244,17 +1247,18 @@ def _canonical_format(fmt):
 
 
 def _format_recursive(key, value, definitions, max_depth):
-    m = _R.lc.rx_format_markers.search(value)
-    if not m:
-        return value
-
-    if max_depth > 1 and value and "{" in value:
+    while max_depth > 1 and _R.lc.rx_format_markers.search(value):
         try:
-            value = value.format(**definitions)
-            return _format_recursive(key, value, definitions, max_depth=max_depth - 1)
+            new_value = value.format(**definitions)
 
         except KeyError:
-            pass
+            break
+
+        if new_value == value:
+            break  # Nothing left to resolve, further passes would yield the same
+
+        value = new_value
+        max_depth -= 1
 
     return value
 
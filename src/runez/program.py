@@ -2,10 +2,13 @@
 Convenience methods for executing programs
 """
 
+import codecs
 import errno
 import fcntl
+import functools
 import os
 import pty
+import pwd
 import shutil
 import struct
 import subprocess  # nosec
@@ -15,12 +18,15 @@ import termios
 from io import BytesIO
 from select import select
 
-from runez.convert import parsed_tabular, to_int
+from runez.convert import to_int
 from runez.system import _R, abort, cached_property, decode, flattened, quoted, resolved_path, short, SYS_INFO, uncolored, UNSET
 
 
+_PS_COLUMNS = ("UID", "PID", "PPID", "CMD")  # Keys of `PsInfo.info`, as reported by `ps -o user=,pid=,ppid=,args=`
+
+
 class PsInfo:
-    """Summary info about a process, as given by `ps -f` command"""
+    """Summary info about a process, as given by `ps` command"""
 
     info = None  # type: dict # Info returned by `ps`
 
@@ -31,9 +37,9 @@ class PsInfo:
         """
         self.pid = to_int(pid) or os.getpid()
         if self.pid:
-            r = run("ps", "-f", self.pid, dryrun=False, fatal=False, logger=None)
+            r = _run_ps(str(self.pid))
             if r.succeeded:
-                info = parsed_tabular(r.output)
+                info = _parsed_ps_output(r.output)
                 if info:
                     self.info = info[0]
 
@@ -129,6 +135,12 @@ class PsInfo:
                 if n is not None:
                     return n
 
+                try:
+                    return pwd.getpwnam(uid).pw_uid
+
+                except KeyError:
+                    pass
+
                 r = run("id", "-u", uid, dryrun=False, fatal=False, logger=None)
                 if r.succeeded:
                     return to_int(r.output)
@@ -143,6 +155,12 @@ class PsInfo:
                 if n is None:
                     return uid
 
+                try:
+                    return pwd.getpwuid(n).pw_name
+
+                except KeyError:
+                    pass
+
                 r = run("id", "-un", uid, dryrun=False, fatal=False, logger=None)
                 if r.succeeded:
                     return r.output
@@ -155,9 +173,50 @@ class PsInfo:
         Returns:
             (list[PsInfo]): List of parent processes
         """
+        self._prefetch_parents()
         p = self.followed_parent if follow else self.parent
         return [p] + p.parent_list(follow=follow) if p else []
 
+    @classmethod
+    def _from_info(cls, pid, info):
+        """PsInfo for 'pid', with already known 'info' (no need to call `ps`)"""
+        p = cls.__new__(cls)
+        p.pid = pid
+        p.info = info
+        return p
+
+    def _prefetch_parents(self):
+        """Get info for all parents with 2 `ps` calls (instead of one per parent)"""
+        if "parent" in self.__dict__ or not self.ppid:
+            return  # Parents already known, or there are none
+
+        r = run("ps", "-A", "-o", "pid=,ppid=", dryrun=False, fatal=False, logger=None)  # '-e' means something else on BSD/macOS
+        if not r.succeeded:
+            return  # Parents will be looked up individually
+
+        ppids = {}
+        for line in r.output.splitlines():
+            pid, _, ppid = line.strip().partition(" ")
+            ppids[to_int(pid)] = to_int(ppid.strip())
+
+        chain = []
+        pid = self.ppid
+        while pid and pid not in chain:
+            chain.append(pid)
+            pid = ppids.get(pid)
+
+        r = _run_ps(",".join(str(pid) for pid in chain))
+        if r.succeeded:
+            infos = dict((to_int(info.get("PID")), info) for info in _parsed_ps_output(r.output))
+            p = self
+            for _ in chain:
+                info = infos.get(p.ppid)
+                if info is None or "parent" in p.__dict__:
+                    break
+
+                p.__dict__["parent"] = parent = PsInfo._from_info(p.ppid, info)
+                p = parent
+
 
 def auto_shellify(args):
     if args and len(args) == 1 and hasattr(args[0], "split"):
@@ -254,7 +313,7 @@ def make_executable(path, fatal=True, logger=UNSET, dryrun=UNSET):
 
     try:
         os.chmod(path, 0o755)  # nosec
-        _R.hlog(logger, "Made '%s' executable" % short(path))
+        _R.hlog(logger, lambda: "Made '%s' executable" % short(path))
         return 1
 
     except Exception as e:
@@ -289,17 +348,26 @@ def run(
     if path_env:
         popen_args["env"] = _added_env_paths(path_env, env=popen_args.get("env"))
 
-    args = flattened(args, shellify=True)
+    if all(isinstance(a, str) for a in args):
+        args = list(args)  # Common case: already flat, and flattened() would keep all strings as-is
+
+    else:
+        args = flattened(args, shellify=True)
+
     full_path = which(program)
     result = RunResult(audit=RunAudit(full_path or program, args, popen_args))
-    description = result.audit.run_description(short_exe=short_exe)
-    if background:
-        description += " &"
-
     abort_logger = None if logger is None else UNSET
-    if logger is True or logger is print:
-        # When logger is True, we just print() the message, so we may as well color it nicely
-        description = _R.colored(description, "bold")
+    if logger is None and not _R.resolved_dryrun(dryrun):
+        description = None  # Nothing will be logged, no need to compute a description of this run
+
+    else:
+        description = result.audit.run_description(short_exe=short_exe)
+        if background:
+            description += " &"
+
+        if logger is True or logger is print:
+            # When logger is True, we just print() the message, so we may as well color it nicely
+            description = _R.colored(description, "bold")
 
     if _R.hdry(dryrun, logger, "run: %s" % description):
         result.audit.dryrun = True
@@ -517,14 +585,17 @@ def which(program, ignore_own_venv=False):
 
         return program if is_executable(program) else None
 
-    for p in os.environ.get("PATH", "").split(os.pathsep):
-        fp = os.path.join(p, program)
-        if SYS_INFO.platform_id.is_windows:  # pragma: no cover
-            fp = _windows_exe(fp)
+    path_env = os.environ.get("PATH", "")
+    try:
+        fp = _which_in_path(program, ignore_own_venv, path_env)
+        if is_executable(fp):
+            return fp  # Previously found, and still there: no need to scan PATH again
 
-        if fp and (not ignore_own_venv or not SYS_INFO.venv_bin_folder or not fp.startswith(SYS_INFO.venv_bin_folder)):
-            if is_executable(fp):
-                return fp
+        _which_in_path.cache_clear()  # Program was removed since: forget all previous lookups
+        return _which_in_path(program, ignore_own_venv, path_env)
+
+    except FileNotFoundError:
+        pass
 
     program = os.path.join(os.getcwd(), program)
     if is_executable(program):
@@ -574,28 +645,45 @@ def _added_env_paths(env_vars, env=None):
         env (dict | None): Original env vars (default: os.environ)
 
     Returns:
-        (dict): Resulting merged env vars
+        (dict): Resulting merged env vars (`env` itself is returned when there is nothing to add)
     """
     if not env:
         env = os.environ
 
-    result = dict(env)
+    result = None
     for env_var, paths in env_vars.items():
-        separator = paths[0]
-        paths = paths[1:]
-        current = env.get(env_var, "")
-        current = [x for x in current.split(separator) if x]
+        merged = _merged_env_path(paths[0], env.get(env_var, ""), paths[1:])
+        if merged is not None:
+            if result is None:
+                result = dict(env)  # Copy env only when it actually needs to be modified
 
-        added = 0
-        for path in paths.split(separator):
-            if path not in current:
-                added += 1
-                current.append(path)
+            result[env_var] = merged
 
-        if added:
-            result[env_var] = separator.join(current)
+    return env if result is None else result
 
-    return result
+
+@functools.lru_cache(maxsize=32)
+def _merged_env_path(separator, current, paths):
+    """
+    Args:
+        separator (str): Separator used in PATH-like env var (example: ':')
+        current (str): Current value of the env var
+        paths (str): 'separator'-separated paths to add to 'current'
+
+    Returns:
+        (str | None): Merged value, if any of 'paths' was not already in 'current'
+    """
+    current = [x for x in current.split(separator) if x]
+    seen = set(current)
+    added = 0
+    for path in paths.split(separator):
+        if path not in seen:
+            seen.add(path)
+            current.append(path)
+            added += 1
+
+    if added:
+        return separator.join(current)
 
 
 def _install_instructions(instructions_dict, platform):
@@ -606,11 +694,39 @@ def _install_instructions(instructions_dict, platform):
     return text
 
 
-def _read_data(fd, length=1024):
-    """Isolated as a function for test mocking"""
+def _read_data(fd, length=65536):
+    """Isolated as a function for test mocking, reads whatever is available (up to 'length' bytes) in one call"""
     return os.read(fd, length)
 
 
+@functools.lru_cache(maxsize=4)
+def _packed_winsize(lines, columns):
+    """Terminal size, as expected by TIOCSWINSZ"""
+    return struct.pack("HHHH", lines, columns, 0, 0)
+
+
+def _parsed_ps_output(output):
+    """
+    Args:
+        output (str): Output of `_run_ps()`, one line per process, no header
+
+    Returns:
+        (list[dict]): Parsed info, one dict per process, keyed by `_PS_COLUMNS`
+    """
+    result = []
+    for line in output.splitlines():
+        values = line.split(None, 3)
+        if len(values) == 4:
+            result.append(dict(zip(_PS_COLUMNS, values)))
+
+    return result
+
+
+def _run_ps(pids):
+    """Columns are pinned (and header omitted), so output can be parsed with a simple split"""
+    return run("ps", "-o", "user=,pid=,ppid=,args=", "-p", pids, dryrun=False, fatal=False, logger=None)
+
+
 def _run_popen(args, popen_args, passthrough, fatal, stdout, stderr):
     """Run subprocess.Popen(), capturing output accordingly"""
     if not passthrough:
@@ -624,9 +740,9 @@ def _run_popen(args, popen_args, passthrough, fatal, stdout, stderr):
     # Capture output, but also let it pass-through as-is to the terminal
     stdout_r, stdout_w = pty.openpty()
     stderr_r, stderr_w = pty.openpty()
-    term_size = struct.pack("HHHH", SYS_INFO.terminal.lines, SYS_INFO.terminal.columns, 0, 0)
-    for fd in (stdout_r, stdout_w, stderr_r, stderr_w):
-        fcntl.ioctl(fd, termios.TIOCSWINSZ, term_size)
+    term_size = _packed_winsize(SYS_INFO.terminal.lines, SYS_INFO.terminal.columns)
+    for fd in (stdout_w, stderr_w):
+        fcntl.ioctl(fd, termios.TIOCSWINSZ, term_size)  # Both ends of a pty share the same window size
 
     passthrough = getattr(passthrough, "stream", passthrough)  # Convenience support for things like logging handlers
     if hasattr(passthrough, "write"):
@@ -642,15 +758,25 @@ def _run_popen(args, popen_args, passthrough, fatal, stdout, stderr):
         os.close(stdout_w)
         os.close(stderr_w)
         readable = [stdout_r, stderr_r]
+        # Chunks read may end in the middle of a multi-byte character, incremental decoders carry those over to next chunk
+        decoders = {fd: codecs.getincrementaldecoder("utf-8")(errors="replace") for fd in readable}
         while readable:
             for fd in select(readable, [], [])[0]:
                 try:
                     data = _read_data(fd)
-                    if not data:
-                        readable.remove(fd)
-                        continue
 
-                    text = decode(data)
+                except OSError as e:
+                    if e.errno != errno.EIO:  # On some OS-es, EIO means EOF
+                        raise
+
+                    data = None
+
+                if not data:
+                    readable.remove(fd)
+
+                # On EOF: flush decoder, so that a truncated multi-byte sequence at the end shows up as replacement character(s)
+                text = decoders[fd].decode(data or b"", final=not data)
+                if text or data:
                     _safe_write(passthrough, text)
                     if fd == stdout_r:
                         _safe_write(sys.stdout, text, flush=sys.stdout.buffer)
@@ -660,12 +786,6 @@ def _run_popen(args, popen_args, passthrough, fatal, stdout, stderr):
                         _safe_write(sys.stderr, text, flush=sys.stderr.buffer)
                         _safe_write(stderr_buffer, data)
 
-                except OSError as e:
-                    if e.errno != errno.EIO:  # On some OS-es, EIO means EOF
-                        raise
-
-                    readable.remove(fd)
-
     sys.stdout.flush()
     sys.stderr.flush()
     os.close(stdout_r)
@@ -690,14 +810,45 @@ def _safe_write(target, data, flush=None):
             pass
 
 
+@functools.lru_cache(maxsize=128)
+def _which_in_path(program, ignore_own_venv, path_env):
+    """Cached part of `which()`, scans folders from 'path_env' for executable 'program'
+
+    Raises FileNotFoundError when 'program' is not found: `lru_cache` does not cache exceptions, so only hits are remembered
+    """
+    for p in _split_path_env(path_env):
+        fp = os.path.join(p, program)
+        if SYS_INFO.platform_id.is_windows:  # pragma: no cover
+            fp = _windows_exe(fp)
+
+        if fp and (not ignore_own_venv or not SYS_INFO.venv_bin_folder or not fp.startswith(SYS_INFO.venv_bin_folder)):
+            if is_executable(fp):
+                return fp
+
+    raise FileNotFoundError(program)
+
+
+@functools.lru_cache(maxsize=4)
+def _split_path_env(path_env):
+    """PATH env var is rarely modified, no need to split it again on every which() call"""
+    return tuple(path_env.split(os.pathsep))
+
+
+@functools.lru_cache(maxsize=4)
+def _windows_extensions(pathext):
+    """Lowercased extensions stated in PATHEXT env var, in order of precedence"""
+    return tuple(e.lower() for e in (pathext or ".COM;.EXE;.BAT;.CMD").split(";") if e)
+
+
 def _windows_exe(path):  # pragma: no cover
     if path:
         if os.path.isfile(path):
             return path
 
-        for extension in (".exe", ".bat"):
+        lpath = path.lower()
+        for extension in _windows_extensions(os.environ.get("PATHEXT")):
             fpath = path
-            if not fpath.lower().endswith(extension):
+            if not lpath.endswith(extension):
                 fpath += extension
 
             if os.path.isfile(fpath):
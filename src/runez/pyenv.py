@@ -1,3 +1,4 @@
+import functools
 import json
 import os
 import re
@@ -11,6 +12,7 @@ from runez.system import _R, cached_property, flattened, joined, ltattr, resolve
 
 CPYTHON = "cpython"
 RX_PYTHON_BASENAME = re.compile(r"^python(\d(\.\d+)?)?$")
+RX_SIMPLE_VERSION = re.compile(r"[0-9]+(\.[0-9]+)*")
 
 
 class ArtifactInfo:
@@ -291,6 +293,11 @@ class PythonSpec:
     Examples: cpython:3, cpython:3.9, pypy:3.9
     """
 
+    __slots__ = ["family", "version", "canonical", "is_min_spec"]
+
+    RX_FAMILY_SPEC = re.compile(r"^(?P<family>cpython|conda|pypy):(?P<version>\d.*)$")
+    RX_SHORT_SPEC = re.compile(r"^(py|python|)(?P<version>\d+(\.\d+(.\w+)*)?)?(?P<min_spec>\+?)$")
+
     def __init__(self, family, version, is_min_spec=False):
         """
         Args:
@@ -349,12 +356,12 @@ class PythonSpec:
         Returns:
             (PythonSpec | None): Parsed spec from given object, if valid
         """
-        m = re.match(r"^(py|python|)(?P<version>\d+(\.\d+(.\w+)*)?)?(?P<min_spec>\+?)$", text)
+        m = cls.RX_SHORT_SPEC.match(text)
         if m:
             version = Version.from_tox_like(m.group("version"), default="3")
             return cls(CPYTHON, version, is_min_spec=bool(m.group("min_spec"))) if version else None
 
-        m = re.match(r"^(?P<family>cpython|conda|pypy):(?P<version>\d.*)$", text)
+        m = cls.RX_FAMILY_SPEC.match(text)
         if m:
             min_spec = False
             version = m.group("version")
@@ -497,7 +504,7 @@ class PythonDepot:
 
     def _find_python(self, spec):
         if isinstance(spec, str):
-            if spec.startswith("~") or spec.startswith(".") or "/" in spec or os.path.exists(spec):
+            if spec[0] in "~." or "/" in spec or os.path.exists(spec):  # 'spec' is not empty here, see find_python()
                 return PythonInstallation.from_path(Path(resolved_path(spec)), short_name=short(spec))
 
             elif spec == "invoker":
@@ -554,42 +561,27 @@ class Version:
         self.local_part = None
         self.prerelease = None
         self.suffix = None
-        m = _R.lc.rx_version.match(self.text)
-        if not m:
+        parsed = _parsed_version(self.text, max_parts)
+        if parsed is None:
             self.ignored = self.text
             return
 
-        self.ignored = m.group("ignored") or None
+        self.ignored, vtext, epoch, local_part, suffix, prerelease, given_components, components, release_number = parsed
         # 'canonical' set to None allows to continue even if there were extraneous bits
         if canonical is not None and self.ignored:
             return
 
-        self.text = m.group("vtext")
-        self.epoch = int(m.group("epoch") or 0)
-        self.local_part = m.group("local") or None
-        pre, pre_num, rel, rel_num, dev, dev_num = m.group("pre", "pre_num", "rel", "rel_num", "dev", "dev_num")
-        if pre == "c":
-            pre = "rc"
-
-        # Order: .devN, aN, bN, rcN, <no suffix>, .postN
-        self.suffix = joined(pre, rel, dev, delimiter=".", keep_empty=None) or None
-        if pre or dev:
-            self.prerelease = pre or "", int(pre_num or 0), rel or "", int(rel_num or 0), dev or "z", int(dev_num or 0)
-            if pre:
-                rel = rel_num = None  # rc.post does not count as .post (but a .post.dev does)
-
-        components = [int(c) for c in m.group("main").split(".")]
-        if len(components) > max_parts:
+        self.text = vtext
+        self.epoch = epoch
+        self.local_part = local_part
+        self.suffix = suffix
+        self.prerelease = prerelease
+        if components is None:
             return  # Invalid version, too many parts
 
-        self.given_components = tuple(components)
-        while len(components) < max_parts:
-            components.append(0)
-
-        self.release_number = None if rel_num is None else int(rel_num or 0)
-        components.append(int(rel_num or 0))
-        components.append(rel or "")
-        self.components = tuple(components)
+        self.given_components = given_components
+        self.release_number = release_number
+        self.components = components
         if canonical is True:
             self.text = self.pep_440
 
@@ -658,39 +650,7 @@ class Version:
     def __lt__(self, other):
         other = Version.from_object(other)
         if isinstance(other, Version):
-            if self.epoch != other.epoch:
-                return self.epoch < other.epoch
-
-            if self.components is None or other.components is None:
-                return bool(other.components)
-
-            if self.components == other.components:
-                if self.prerelease == other.prerelease:
-                    my_parts = self.local_parts
-                    other_parts = other.local_parts
-                    if my_parts is None or other_parts is None:
-                        return bool(other_parts)
-
-                    for mine, theirs in zip(my_parts, other_parts):
-                        if mine == theirs:
-                            continue
-
-                        if theirs.isdigit():
-                            return not mine.isdigit() or int(mine) < int(theirs)
-
-                        if mine.isdigit():
-                            return False
-
-                        return mine < theirs
-
-                    return len(my_parts) < len(other_parts)
-
-                if self.prerelease is None or other.prerelease is None:
-                    return bool(self.prerelease)
-
-                return self.prerelease < other.prerelease
-
-            return self.components < other.components
+            return self._sort_key < other._sort_key
 
     def __le__(self, other):
         other = Version.from_object(other)
@@ -704,6 +664,18 @@ class Version:
         other = Version.from_object(other)
         return other is None or other < self
 
+    @cached_property
+    def _sort_key(self):
+        """Tuple sorting the same way as this version should, can be compared without any python-level logic"""
+        if self.components is None:
+            return self.epoch, 0  # Invalid versions sort lower than valid ones
+
+        # Pre-releases sort lower than final releases
+        prerelease = (1,) if self.prerelease is None else (0, self.prerelease)
+        # Numeric local parts sort higher than alphanumeric ones, no local part sorts lower than any local part
+        local_parts = tuple((1, int(x)) if x.isdigit() else (0, x) for x in self.local_parts or ())
+        return self.epoch, 1, self.components, prerelease, local_parts
+
     @cached_property
     def given_components_count(self):
         return len(self.given_components) if self.given_components else 0
@@ -792,6 +764,63 @@ class Version:
             return "".join(result)
 
 
+@functools.lru_cache(maxsize=512)
+def _parsed_version(text, max_parts):
+    """
+    Versions are often parsed repeatedly from the same text (pyenv/PATH scans, comparisons with str-s...),
+    this returns immutable parsed info only, so it can be shared among Version objects.
+
+    Args:
+        text (str): Text to be parsed
+        max_parts (int): Maximum number of parts (components) to consider version valid
+
+    Returns:
+        (tuple | None): ignored, vtext, epoch, local_part, suffix, prerelease, given_components, components, release_number
+    """
+    if RX_SIMPLE_VERSION.fullmatch(text):
+        # Most common case, final release like 3.11.5: no need to go through the full PEP-440 regex
+        main = text.split(".")
+        vtext = text
+        ignored = local_part = suffix = prerelease = rel = rel_num = None
+        epoch = 0
+
+    else:
+        m = _R.lc.rx_version.match(text)
+        if not m:
+            return None
+
+        vtext = m.group("vtext")
+        ignored = m.group("ignored") or None
+        epoch = int(m.group("epoch") or 0)
+        local_part = m.group("local") or None
+        prerelease = None
+        pre, pre_num, rel, rel_num, dev, dev_num = m.group("pre", "pre_num", "rel", "rel_num", "dev", "dev_num")
+        if pre == "c":
+            pre = "rc"
+
+        # Order: .devN, aN, bN, rcN, <no suffix>, .postN
+        suffix = joined(pre, rel, dev, delimiter=".", keep_empty=None) or None
+        if pre or dev:
+            prerelease = pre or "", int(pre_num or 0), rel or "", int(rel_num or 0), dev or "z", int(dev_num or 0)
+            if pre:
+                rel = rel_num = None  # rc.post does not count as .post (but a .post.dev does)
+
+        main = m.group("main").split(".")
+
+    components = [int(c) for c in main]
+    if len(components) > max_parts:
+        return ignored, vtext, epoch, local_part, suffix, prerelease, None, None, None
+
+    given_components = tuple(components)
+    while len(components) < max_parts:
+        components.append(0)
+
+    release_number = None if rel_num is None else int(rel_num or 0)
+    components.append(int(rel_num or 0))
+    components.append(rel or "")
+    return ignored, vtext, epoch, local_part, suffix, prerelease, given_components, tuple(components), release_number
+
+
 class PythonInstallation:
     """Models a specific python installation"""
 
@@ -956,6 +985,7 @@ class PythonInstallationLocation:
     def __init__(self, location):
         self.location = location
         self._preferred_python = UNSET  # type: PythonInstallation # Auto-selected preferred python from this location
+        self._found_pythons = {}  # type: dict[PythonSpec, PythonInstallation | None] # Outcome of previous find_python() calls
 
     def __repr__(self):
         return short(self.location)
@@ -994,12 +1024,11 @@ class PythonInstallationLocation:
         # Default: pythons from a folder containing pythonM.m symlinks, eg: /opt/my-python-binaries/
         result = []
         for item in ls_dir(self.location):
-            if item.is_file():
-                m = RX_PYTHON_BASENAME.match(item.name)
-                if m and m.group(2):
-                    python = PythonInstallation(item)
-                    if not python.problem:
-                        result.append(python)
+            m = RX_PYTHON_BASENAME.match(item.name)
+            if m and m.group(2) and item.is_file():
+                python = PythonInstallation(item)
+                if not python.problem:
+                    result.append(python)
 
         return sorted(result, reverse=True)
 
@@ -1017,12 +1046,29 @@ class PythonInstallationLocation:
         Returns:
             (list[PythonInstallation]): Python installations found in this location
         """
+        self._found_pythons = {}  # Scanned pythons (may) have changed, previous find_python() outcomes no longer apply
         return self._scanned_location()
 
     def find_python(self, spec):
-        for python in self.available_pythons:
-            if python.satisfies(spec):
-                return python
+        """
+        Args:
+            spec (PythonSpec): Spec to find
+
+        Returns:
+            (PythonInstallation | None): First (best) python installation satisfying 'spec', if any
+        """
+        available = self.available_pythons  # Accessed first: a re-scan drops previous outcomes from `self._found_pythons`
+        found = self._found_pythons.get(spec, UNSET)
+        if found is UNSET:
+            found = None
+            for python in available:
+                if python.satisfies(spec):
+                    found = python
+                    break
+
+            self._found_pythons[spec] = found  # Outcome can't change until available pythons are re-scanned
+
+        return found
 
     def representation(self):
         """(str): Textual representation of available pythons"""
@@ -1044,20 +1090,23 @@ class PythonInstallationLocationPathEnvVar(PythonInstallationLocation):
     def _scanned_location(self):
         result = []
         venv = os.environ.get("VIRTUAL_ENV")
-        for folder in flattened(os.environ.get("PATH"), split=os.pathsep):
+        for folder in os.environ.get("PATH", "").split(os.pathsep):
+            folder = folder.strip()  # Same as previously used `flattened(..., split=os.pathsep)`, which strips by default
+            if not folder:
+                continue
+
             if venv and folder.startswith(venv):
                 continue  # Ignore python installations from virtualenv
 
             general = []  # General symlinks, eg: `python3` and `python`
             major_minors = []  # Major.minor symlinks, eg: `python3.7`
             for item in ls_dir(folder):
-                if is_executable(item):
-                    m = RX_PYTHON_BASENAME.match(item.name)
-                    if m:
-                        python = PythonInstallation(item)
-                        if not python.problem:
-                            target = major_minors if m.group(2) else general
-                            target.append(python)
+                m = RX_PYTHON_BASENAME.match(item.name)  # Checked first, as it is much cheaper than a stat() call
+                if m and is_executable(item):
+                    python = PythonInstallation(item)
+                    if not python.problem:
+                        target = major_minors if m.group(2) else general
+                        target.append(python)
 
             result.extend(sorted(general, key=lambda x: x.executable))
             result.extend(sorted(major_minors, reverse=True))
@@ -1087,12 +1136,11 @@ class PythonInstallationLocationSubFolders(PythonInstallationLocation):
     def _scanned_location(self):
         result = []
         for item in ls_dir(os.path.dirname(self.location)):
-            if item.is_dir():
-                m = RX_PYTHON_BASENAME.match(item.name)
-                if m and m.group(2):
-                    python = PythonInstallation(item / "bin" / item.name, short_name=short(item))
-                    if not python.problem:
-                        result.append(python)
+            m = RX_PYTHON_BASENAME.match(item.name)
+            if m and m.group(2) and item.is_dir():
+                python = PythonInstallation(item / "bin" / item.name, short_name=short(item))
+                if not python.problem:
+                    result.append(python)
 
         return sorted(result, reverse=True)
 
@@ -4,6 +4,7 @@ Base functionality used by other parts of `runez`.
 This class should not import any other `runez` class, to avoid circular deps.
 """
 
+import functools
 import inspect
 import logging
 import os
@@ -12,7 +13,7 @@ import shutil
 import sys
 import threading
 import unicodedata
-from io import StringIO
+from io import TextIOBase
 
 
 ABORT_LOGGER = logging.error
@@ -244,7 +245,7 @@ def capped(value, minimum=None, maximum=None, key=None, none_ok=False):
 
 
 def decode(value, strip=None):
-    """Python 2/3 friendly decoding of output.
+    """Decoding of output, when it is given as bytes.
 
     Args:
         value (str | bytes | None): The value to decode.
@@ -253,11 +254,12 @@ def decode(value, strip=None):
     Returns:
         str: Decoded value, if applicable.
     """
-    if value is None:
-        return None
+    if type(value) is not str:  # Most common case is an already decoded str, a simple identity check suffices for it
+        if isinstance(value, bytes):
+            value = value.decode("utf-8")
 
-    if isinstance(value, bytes):
-        value = value.decode("utf-8")
+        elif value is None:
+            return None
 
     if strip:
         if strip is True:
@@ -317,6 +319,17 @@ def first_line(text, keep_empty=False, default=None):
     if text is None:
         return default
 
+    if isinstance(text, str):
+        # Look only at the start of 'text', no need to split all of it in lines
+        if not keep_empty:
+            text = text.lstrip()  # First non-empty line is now the first line of 'text' (all lines before it were blank)
+
+        if not text:
+            return default
+
+        line = _R.lc.rx_line_boundary.split(text, maxsplit=1)[0]
+        return line if keep_empty else line.strip()
+
     if hasattr(text, "splitlines"):
         text = text.splitlines()
 
@@ -363,8 +376,34 @@ def flattened(*value, keep_empty=False, split=None, shellify=False, strip=None,
     if shellify and keep_empty is False:
         keep_empty = True  # shellify forces keep_empty to True, can be overridden with an explicit keep_empty=""
 
-    for item in value:
-        _flatten(result, item, keep_empty, split, shellify, strip, transform, unique, none)
+    seen = set() if unique else None
+    stack = [(iter(value), split)]  # Iterators being walked, along with the 'split' setting that applies to them
+    while stack:
+        items, item_split = stack[-1]
+        for item in items:
+            if item and isinstance(item, str):
+                if item_split:
+                    if "\n" in item:
+                        stack.append((iter([s for s in (line.strip() for line in item.splitlines()) if s]), item_split))
+                        break
+
+                    stack.append((iter(item.split(item_split) if isinstance(item_split, str) else item.split()), None))
+                    break
+
+                if strip is True:
+                    item = item.strip()
+
+                elif strip:
+                    item = item.strip(strip)
+
+            elif is_iterable(item):
+                stack.append((iter(item), item_split))
+                break
+
+            _flattened_add(result, seen, item, keep_empty, shellify, transform, none)
+
+        else:
+            stack.pop()
 
     return result
 
@@ -549,21 +588,14 @@ def quoted(*items, delimiter=" ", adapter=UNSET, keep_empty=True, strip=None, st
         (str): Quoted if 'text' contains spaces
     """
     items = flattened(items, keep_empty=keep_empty, strip=strip, transform=stringify, unique=unique)
-    result = []
     if adapter is UNSET:
         adapter = Anchored.short
 
-    for text in items:
-        if adapter:
-            text = adapter(text)
-
-        if text and " " in text:
-            sep = "'" if '"' in text else '"'
-            text = "%s%s%s" % (sep, text, sep)
+    if adapter:
+        items = map(adapter, items)
 
-        result.append(text)
-
-    return delimiter.join(result)
+    # Look for '"' only in the (rare) texts that need quoting, in order to pick the quote character to use
+    return delimiter.join((("'%s'" if '"' in t else '"%s"') % t) if t and " " in t else t for t in items)
 
 
 def resolved_path(path, base=None):
@@ -575,14 +607,25 @@ def resolved_path(path, base=None):
     Returns:
         (str): Absolute path
     """
-    if not path or str(path).startswith(SYMBOLIC_TMP):
+    if not path:
         return path
 
-    path = os.path.expanduser(path)
-    if base and not os.path.isabs(path):
-        path = os.path.join(resolved_path(base), path)
+    text = str(path)
+    if text.startswith(SYMBOLIC_TMP):
+        return path
 
-    return os.path.abspath(path)
+    if text.startswith("~"):
+        text = os.path.expanduser(text)
+
+    if os.path.isabs(text):
+        return _resolved_path(text, None, None)
+
+    if base:
+        base = str(base)
+        if base.startswith("~"):
+            base = os.path.expanduser(base)  # Expanded here, as cached `_resolved_path()` must not depend on $HOME
+
+    return _resolved_path(text, base, os.getcwd())
 
 
 def short(value, size=UNSET, none="None", uncolor=False):
@@ -763,6 +806,7 @@ class Anchored:
 
     _home = None
     _paths = []  # Currently stacked anchored folders that can be simplified away, via short()
+    _rx_paths = None  # Regex matching any of the `_paths` above (computed lazily, reset whenever `_paths` is modified)
 
     def __init__(self, *folders):
         self.folders = folders
@@ -780,6 +824,7 @@ class Anchored:
             *anchors (str | pathlib.Path | list | tuple): Optional paths to use as anchors for short()
         """
         cls._paths = sorted((resolved_path(p) for p in flattened(anchors, unique=True)), reverse=True)
+        cls._rx_paths = None
 
     @classmethod
     def add(cls, anchors):
@@ -799,6 +844,7 @@ class Anchored:
             anchor = resolved_path(anchor)
             if anchor in cls._paths:
                 cls._paths.remove(anchor)
+                cls._rx_paths = None
 
     @classmethod
     def short(cls, text):
@@ -814,9 +860,11 @@ class Anchored:
 
         text = stringified(text)
         if cls._paths:
-            for p in cls._paths:
-                if p:
-                    text = text.replace(p + os.path.sep, "")
+            if cls._rx_paths is None:
+                # Longest paths first (`_paths` is reverse-sorted), so that nested anchors are simplified away as a whole
+                cls._rx_paths = re.compile("|".join(re.escape(p + os.path.sep) for p in cls._paths if p))
+
+            text = cls._rx_paths.sub("", text)
 
         if cls._home:
             text = text.replace(cls._home, "~")
@@ -824,13 +872,39 @@ class Anchored:
         return text
 
 
+class CaptureBuffer(TextIOBase):
+    """Text stream accumulating written chunks in a list, joined only when its value is requested"""
+
+    def __init__(self):
+        super().__init__()
+        self.chunks = []
+
+    def write(self, text):
+        if not isinstance(text, str):
+            raise TypeError("string argument expected, got '%s'" % type(text).__name__)
+
+        self.chunks.append(text)
+        return len(text)
+
+    def getvalue(self):
+        """str: Everything written so far"""
+        if len(self.chunks) > 1:
+            self.chunks = ["".join(self.chunks)]  # Keep joined value, so that repeated calls are cheap
+
+        return self.chunks[0] if self.chunks else ""
+
+    def clear(self):
+        """Forget everything written so far"""
+        self.chunks = []
+
+
 class CapturedStream:
     """Capture output to a stream by hijacking temporarily its write() function"""
 
     def __init__(self, name, target):
         self.name = name
         self.target = target
-        self.buffer = StringIO()
+        self.buffer = CaptureBuffer()
         target_class = stringified(self.target.__class__).lower()
         self.capture_write = "_pytest" in target_class or "wrapper" in target_class
         if self.capture_write and self.target.write.__name__ == self.captured_write.__name__:
@@ -882,8 +956,7 @@ class CapturedStream:
 
     def clear(self):
         """Clear captured content"""
-        self.buffer.seek(0)
-        self.buffer.truncate(0)
+        self.buffer.clear()
 
 
 class CaptureOutput:
@@ -901,6 +974,7 @@ class CaptureOutput:
     """
 
     _capture_stack = []  # Shared across all objects, tracks possibly nested CaptureOutput buffers
+    _formatter = logging.Formatter("%(levelname)s %(message)s")  # Shared by all 'seed_logging' handlers
 
     def __init__(self, stdout=True, stderr=True, anchors=None, dryrun=UNSET, seed_logging=False, trace=False):
         """Context manager allowing to temporarily grab stdout/stderr/log output.
@@ -949,7 +1023,7 @@ class CaptureOutput:
         if self.seed_logging and not _has_stream_handler():
             # Define a logging handler, IsolatedLogSetup cleared them all
             self.handler = logging.StreamHandler(stream=self.tracked.captured[-1].buffer)
-            self.handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+            self.handler.setFormatter(self._formatter)
             self.handler.setLevel(logging.DEBUG)
             logging.root.addHandler(self.handler)
 
@@ -983,22 +1057,49 @@ class CurrentFolder:
         self.anchor = anchor
         self.destination = resolved_path(destination)
         self.current_folder = None
+        self._current_fd = None  # Open fd of folder to restore, where supported (avoids re-walking path on exit)
 
     def __enter__(self):
         if not _R.is_dryrun() or os.path.exists(self.destination):
-            self.current_folder = os.getcwd()
-            os.chdir(self.destination)
+            if os.chdir in os.supports_fd and hasattr(os, "O_DIRECTORY"):
+                try:
+                    # O_PATH (where available) does not require read permission on current folder (neither does os.getcwd())
+                    self._current_fd = os.open(os.curdir, getattr(os, "O_PATH", os.O_RDONLY) | os.O_DIRECTORY)
+
+                except OSError:
+                    pass
+
+            if self._current_fd is None:
+                self.current_folder = os.getcwd()
+
+            try:
+                os.chdir(self.destination)
+
+            except Exception:
+                self._restore()
+                raise
 
         if self.anchor:
             Anchored.add(self.destination)
 
     def __exit__(self, *_):
-        if self.current_folder:
-            os.chdir(self.current_folder)
-
+        self._restore()
         if self.anchor:
             Anchored.pop(self.destination)
 
+    def _restore(self):
+        if self._current_fd is not None:
+            try:
+                os.fchdir(self._current_fd)
+
+            finally:
+                os.close(self._current_fd)
+                self._current_fd = None
+
+        elif self.current_folder:
+            os.chdir(self.current_folder)
+            self.current_folder = None
+
 
 class TrackedOutput:
     """Track captured output"""
@@ -2028,6 +2129,11 @@ class _LazyCache:
     def rx_format_markers(self):
         return re.compile(r"{([a-z]\w*)}", re.IGNORECASE)
 
+    @cached_property
+    def rx_line_boundary(self):
+        # Same line boundaries as str.splitlines()
+        return re.compile("\r\n|[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]")
+
     @cached_property
     def rx_spaces(self):
         return re.compile(r"[\s\n]+", re.MULTILINE)
@@ -2144,7 +2250,7 @@ class _R:
             return
 
         if logger is False:
-            cls.trace(_R.actual_message(message))
+            cls.trace(message)  # 'message' gets resolved only if tracing is currently enabled
             return
 
         if logger is True or logger is print:
@@ -2229,7 +2335,7 @@ class _R:
     def trace(cls, message, *args):
         """
         Args:
-            message (str): Message to trace
+            message (str | callable): Message to trace
         """
         cls.lc.rm.log.trace(message, *args)
 
@@ -2246,49 +2352,29 @@ class _R:
             return _R.find_parent_folder(dirpath, basenames)
 
 
-def _flatten(result, value, keep_empty, split, shellify, strip, transform, unique, none):
-    if value and isinstance(value, str):
-        if split:
-            if "\n" in value:
-                value = [s for s in (line.strip() for line in value.splitlines()) if s]
-                if value:
-                    _flatten(result, value, keep_empty, split, shellify, strip, transform, unique, none)
-
-                return
-
-            if isinstance(split, str):
-                value = value.split(split)
-
-            else:
-                value = value.split()
-
-            if value:
-                _flatten(result, value, keep_empty, None, shellify, strip, transform, unique, none)
-
-            return
-
-        if strip is True:
-            value = value.strip()
-
-        elif strip:
-            value = value.strip(strip)
-
-    elif is_iterable(value):
-        for item in value:
-            _flatten(result, item, keep_empty, split, shellify, strip, transform, unique, none)
-
-        return
-
+def _flattened_add(result, seen, value, keep_empty, shellify, transform, none):
     value = _keep_transform(value, keep_empty, shellify, transform, none)
     if value is UNSET:
         if shellify and result and result[-1].startswith("-"):
             # Convenience: allow to filter out ["--switch", None] easily
-            result.pop(-1)
+            popped = result.pop(-1)
+            if seen is not None:
+                seen.discard(popped)
 
         return
 
-    if not unique or value not in result:
-        result.append(value)
+    if seen is not None:
+        try:
+            if value in seen:
+                return
+
+            seen.add(value)
+
+        except TypeError:  # Unhashable value, fall back to scanning what we have so far
+            if value in result:
+                return
+
+    result.append(value)
 
 
 def _keep_transform(value, keep_empty, shellify, transform, none):
@@ -2340,6 +2426,15 @@ def _prettified(value):
         return "function '%s'" % value.__name__
 
 
+@functools.lru_cache(maxsize=1024)
+def _resolved_path(path, base, cwd):
+    """Cached part of `resolved_path()`, 'cwd' is part of the cache key only (and is `None` for absolute paths)"""
+    if base:
+        path = os.path.join(base, path)
+
+    return os.path.abspath(path)
+
+
 def _show_abort_message(message, exc_info, fatal, logger):
     if logger is not None:
         if logging.root.handlers:
@@ -5,7 +5,6 @@ import pytest
 import runez
 from runez.__main__ import main
 from runez.conftest import cli, isolated_log_setup, IsolatedLogSetup, logged, temp_folder
-from runez.file import readlines
 from runez.http import GlobalHttpCalls
 from runez.logsetup import LogManager
 from runez.system import CaptureOutput, LOG, short, stringified
@@ -51,15 +50,13 @@ class TempLog:
 
     def expect_logged(self, *expected):
         assert self.logfile, "Logging to a file was not setup"
-        remaining = set(expected)
         with open(LogManager.file_handler.baseFilename, "rt") as fh:
-            for line in fh:
-                found = [msg for msg in remaining if msg in line]
-                remaining.difference_update(found)
+            contents = fh.read()
 
+        remaining = [msg for msg in expected if msg not in contents]
         if remaining:
             LOG.info("File contents:")
-            LOG.info("\n".join(readlines(LogManager.file_handler.baseFilename)))
+            LOG.info(contents.rstrip("\n"))
 
         assert not remaining
 
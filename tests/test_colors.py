@@ -136,6 +136,13 @@ def test_flavor(monkeypatch):
 
 
 def test_no_color():
+    with runez.ActivateColors(enable=False):
+        plain_fg = runez.color.fg
+        assert runez.red("foo") == "foo"
+
+    with runez.ActivateColors(enable=False):
+        assert runez.color.fg is plain_fg  # Plain renderables are shared
+
     r = runez.run(sys.executable, "-mrunez", "colors", "--no-color", fatal=False)
     assert r.succeeded
     assert "Backend: plain" in r.output
@@ -212,10 +212,12 @@ def test_ini_to_dict(temp_folder, logged):
 
 def test_failure(monkeypatch):
     monkeypatch.setattr(io, "open", runez.conftest.exception_raiser())
+    monkeypatch.setattr(os, "open", runez.conftest.exception_raiser())
     monkeypatch.setattr(os, "unlink", runez.conftest.exception_raiser("bad unlink"))
-    monkeypatch.setattr(shutil, "copy", runez.conftest.exception_raiser())
+    monkeypatch.setattr(shutil, "copy2", runez.conftest.exception_raiser())
     monkeypatch.setattr(os.path, "exists", lambda _: True)
     monkeypatch.setattr(os.path, "isfile", lambda _: True)
+    monkeypatch.setattr(runez.file, "_unlinkable", lambda _: True)
     monkeypatch.setattr(os.path, "getsize", lambda _: 10)
     with runez.CaptureOutput() as logged:
         with patch("runez.file._do_delete"):
@@ -244,6 +246,26 @@ def test_file_inspection(temp_folder, logged):
     assert runez.delete("sample") == 1
     assert "Deleted sample" in logged.pop()
 
+    # Folders deleted or moved (via runez or not) get re-created as needed
+    assert runez.ensure_folder("sample/sub") == 1
+    assert runez.ensure_folder("sample/sub") == 0
+    assert runez.move("sample", "sample2", logger=None) == 1
+    assert runez.ensure_folder("sample/sub", logger=None) == 1
+    assert runez.delete("sample", logger=None) == 1
+    assert runez.delete("sample2", logger=None) == 1
+    assert runez.ensure_folder("sample/sub") == 1
+    assert runez.delete("sample") == 1
+    assert runez.write("sample/a.txt", "1", logger=None) == 1
+    shutil.rmtree("sample")
+    assert runez.write("sample/a.txt", "2", fatal=False, logger=None) == 1
+    assert list(runez.readlines("sample/a.txt")) == ["2"]
+    assert runez.ensure_folder("sample/sub", logger=None) == 1
+    os.rmdir("sample/sub")
+    assert runez.ensure_folder("sample/sub", logger=None) == 1
+    assert os.path.isdir("sample/sub")
+    assert runez.delete("sample", logger=None) == 1
+    logged.pop()
+
     sample = runez.DEV.tests_path("sample.txt")
     assert len(list(runez.readlines(sample))) == 4
     assert len(list(runez.readlines(sample, first=1))) == 1
@@ -269,6 +291,31 @@ def test_file_inspection(temp_folder, logged):
     assert list(runez.readlines("not-a-text-file", first=1)) == [" hello"]
     assert not logged
 
+    # Both text and bytes contents can be written
+    assert runez.write("sample", "lucky ☘\n", logger=None) == 1
+    assert list(runez.readlines("sample")) == ["lucky ☘"]
+    assert runez.write("sample", "a\r\nb\rc\x0cd\n\ne", logger=None) == 1
+    expected = ["a\n", "b\n", "c\x0cd\n", "\n", "e"]
+    assert list(runez.readlines("sample", transform=None)) == expected
+    with patch("runez.file.SMALL_FILE_SIZE", 0):  # Larger files are streamed, with same outcome
+        assert list(runez.readlines("sample", transform=None)) == expected
+
+    if os.path.exists("/dev/urandom"):
+        # Non-regular files report st_size 0, they must be streamed (reading them in one go would never end)
+        assert len(list(runez.readlines("/dev/urandom", first=1))) == 1
+
+    assert runez.write("sample", b"\x89 hello", logger=None) == 1
+    with io.open("sample", "rb") as fh:
+        assert fh.read() == b"\x89 hello"
+
+    # Touching an existing file updates its modification time only
+    os.utime("sample", (1000000000, 1000000000))
+    assert runez.touch("sample") == 1
+    assert "Touched sample" in logged.pop()
+    assert runez.file.is_younger("sample", age=10)
+    with io.open("sample", "rb") as fh:
+        assert fh.read() == b"\x89 hello"
+
     assert runez.copy("bar", "baz", fatal=False) == -1
     assert "does not exist" in logged.pop()
     assert runez.move("bar", "baz", fatal=False) == -1
@@ -326,6 +373,9 @@ def test_file_operations(temp_folder):
     runez.symlink("foo", "dangling-symlink", must_exist=False)
     runez.move("dangling-symlink", "dangling-symlink2")
     assert os.path.islink("dangling-symlink2")
+    assert runez.delete("dangling-symlink2") == 1
+    assert not os.path.islink("dangling-symlink2")
+    assert runez.delete("dangling-symlink2") == 0
 
     runez.write("README.md", "hello")
     runez.copy("README.md", "sample1/README.md")
@@ -344,6 +394,15 @@ def test_file_operations(temp_folder):
     runez.copy("sample1", "sample2/foo", overwrite=None)
     assert dir_contents("sample2") == {"foo": {"foo": ["hello"]}}
 
+    # Modification time and mode are preserved
+    os.utime("README.md", (1000000000, 1000000000))
+    os.chmod("README.md", 0o600)
+    runez.copy("README.md", "sample3/README.md")
+    runez.copy("sample3", "sample4")
+    for path in ("sample3/README.md", "sample4/README.md"):
+        assert os.path.getmtime(path) == 1000000000
+        assert os.stat(path).st_mode & 0o777 == 0o600
+
     with runez.CaptureOutput(dryrun=True) as logged:
         assert runez.ensure_folder("some-folder", fatal=False) == 1
         assert "Would create" in logged.pop()
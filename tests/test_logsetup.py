@@ -81,6 +81,14 @@ def test_clean_handlers(temp_log):
     assert len(logging.root.handlers) == 1
 
 
+def test_wrapped_handler():
+    # pytest's capture handler is a singleton, re-constructing it only resets accumulated logs
+    handler = WrappedHandler()
+    handler.records.append(logging.makeLogRecord({"msg": "hello"}))
+    assert WrappedHandler() is handler
+    assert not handler.records
+
+
 def test_console(temp_log):
     logger = logging.getLogger("runez")
     old_level = logger.level
@@ -246,6 +254,8 @@ def test_formatted():
     assert formatted("foo %s {0}", "bar") == "foo bar {0}"  # '%s' format used first
 
     assert formatted("foo %s {a}", "bar", a="val_a") == "foo %s val_a"  # '%s' does not apply when there are kwargs
+    assert formatted("foo %s", a="val_a") == "foo %s"
+    assert formatted("foo }", "bar", a="val_a") == "foo }"  # No placeholders at all, no format() attempted
 
     # Bogus formats
     assert formatted("foo %s %s {0}", "bar") == "foo %s %s bar"  # bogus '%s' format
@@ -459,6 +469,7 @@ def test_setup(temp_log, monkeypatch):
         assert runez.DRYRUN
         logging.debug("hello")
         runez.log.trace("some trace info")
+        runez.log.trace(runez.conftest.exception_raiser("callable messages are resolved only when tracing"))
         assert "some trace info" not in temp_log  # Tracing not enabled
         assert not temp_log
 
@@ -477,6 +488,8 @@ def test_setup(temp_log, monkeypatch):
         logging.warning("hello")
         runez.log.trace("some trace %s", "info")
         assert ":: some trace info" in temp_log  # Tracing forcibly enabled
+        runez.log.trace(lambda: "some lazy trace")
+        assert ":: some lazy trace" in temp_log
         assert "WARNING hello" in temp_log.stdout.pop()
         assert not temp_log.stderr
 
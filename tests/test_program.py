@@ -80,6 +80,19 @@ def test_capture(monkeypatch):
 
         r = runez.run(CHATTER, "hello", fatal=True, passthrough=True)
         assert r == RunResult("hello", "", 0)
+        logged.pop()
+        with patch("runez.program._read_data", side_effect=lambda fd: os.read(fd, 1)):
+            # Multi-byte characters split across reads are passed through correctly
+            r = runez.run(CHATTER, "lucky ☘", passthrough=True)
+            assert r == RunResult("lucky ☘", "", 0)
+            assert "lucky ☘" in logged.pop()
+
+        # A truncated multi-byte sequence at the end of the stream shows up as a replacement character
+        stream = runez.system.CaptureBuffer()
+        r = runez.run(sys.executable, "-c", "import sys; sys.stdout.buffer.write(b'lucky \\xe2\\x98')", passthrough=stream)
+        assert r.succeeded
+        assert stream.getvalue() == "lucky \ufffd"
+        assert "lucky \ufffd" in logged.pop()
 
         crasher = CrashingWrite()
         r = runez.run(CHATTER, "hello", fatal=True, passthrough=crasher)
@@ -295,22 +308,11 @@ def test_ps():
 
 
 def simulated_ps_output(pid, ppid, cmd):
-    template = "UID   PID  PPID CMD\n  0 {pid:>5} {ppid:>5} {cmd}"
+    template = "  0 {pid:>5} {ppid:>5} {cmd}"
     return RunResult(output=template.format(pid=pid, ppid=ppid, cmd=cmd), code=0)
 
 
-def simulated_tmux(program, *args, **_):
-    if program == "tmux":
-        return RunResult(output="3", code=0)
-
-    if program == "id":
-        if args[0] == "-un":
-            return RunResult(output="root", code=0)
-
-        return RunResult(output="0", code=0)
-
-    assert program == "ps"
-    pid = args[1]
+def simulated_ps(pid):
     if pid == 1:
         return simulated_ps_output(pid, 0, "/sbin/init")
 
@@ -326,6 +328,38 @@ def simulated_tmux(program, *args, **_):
     return simulated_ps_output(pid, 2, "/dev/null/some-test foo bar")
 
 
+def simulated_ps_table(fmt, pids=None):
+    if pids is None:  # All processes
+        pids = [1, 2, 3, os.getpid()]
+
+    rows = [simulated_ps(pid).output for pid in pids]
+    if fmt == "pid=,ppid=":
+        return RunResult(output="\n".join(" ".join(row.split()[1:3]) for row in rows), code=0)
+
+    return RunResult(output="\n".join(rows), code=0)
+
+
+def simulated_tmux(program, *args, **_):
+    if program == "tmux":
+        return RunResult(output="3", code=0)
+
+    if program == "id":
+        if args[0] == "-un":
+            return RunResult(output="root", code=0)
+
+        return RunResult(output="0", code=0)
+
+    assert program == "ps"
+    if args[0] == "-A":
+        return simulated_ps_table(args[2])
+
+    pids = [int(pid) for pid in args[3].split(",")]
+    if len(pids) == 1:
+        return simulated_ps(pids[0])
+
+    return simulated_ps_table(args[1], pids=pids)
+
+
 def test_ps_follow():
     with patch("runez.program.run", side_effect=simulated_tmux):
         assert runez.PsInfo.from_pid(-1) is None
@@ -363,6 +397,21 @@ def test_ps_follow():
             assert p.cmd_basename == "some-test foo"
 
 
+def test_ps_parents():
+    with patch("runez.program.run", side_effect=simulated_tmux) as mocked_run:
+        p = runez.PsInfo()
+        assert [x.pid for x in p.parent_list(follow=False)] == [2, 1]
+        assert [x.cmd for x in p.parent_list(follow=False)] == ["tmux new-session ...", "/sbin/init"]
+        assert mocked_run.call_count == 3  # One `ps` for 'p' itself, then 2 calls to get all its parents
+
+        # `id` is used for uids that are not known to the pwd database
+        with patch("pwd.getpwnam", side_effect=KeyError), patch("pwd.getpwuid", side_effect=KeyError):
+            assert p.userid == "root"
+            p = runez.PsInfo()
+            p.info["UID"] = "root"
+            assert p.uid == 0
+
+
 def check_ri(platform, instructions=None):
     with pytest.raises(Exception) as exc:
         runez.program.require_installed("foo", instructions=instructions, platform=platform)
@@ -434,7 +483,15 @@ def test_run_description():
     assert audit.run_description() == "foo --help"
 
 
-def test_which():
+def test_added_env_paths():
+    env = {"PATH": "/usr/bin:/bin", "FOO": "a"}
+    assert runez.program._added_env_paths({"PATH": ":/bin"}, env=env) is env  # Nothing to add, env returned as-is
+    r = runez.program._added_env_paths({"PATH": ":/usr/bin:/opt/bin", "CPPFLAGS": " -I/opt/include"}, env=env)
+    assert r == {"PATH": "/usr/bin:/bin:/opt/bin", "FOO": "a", "CPPFLAGS": "-I/opt/include"}
+    assert env == {"PATH": "/usr/bin:/bin", "FOO": "a"}
+
+
+def test_which(monkeypatch, temp_folder):
     assert runez.which(None) is None
     assert runez.which("/dev/null") is None
     assert runez.which("dev/null") is None
@@ -442,6 +499,29 @@ def test_which():
     ps = runez.which("python")
     assert pp == ps
 
+    # Lookups are cached, but the cached entry is verified to still be there
+    runez.write("bin/foo", "#!/bin/sh\n", logger=None)
+    runez.make_executable("bin/foo", logger=None)
+    monkeypatch.setenv("PATH", os.path.join(temp_folder, "bin"))
+    runez.program._which_in_path.cache_clear()
+    assert runez.which("foo") == os.path.join(temp_folder, "bin", "foo")
+    assert runez.which("foo") == os.path.join(temp_folder, "bin", "foo")
+    assert runez.program._which_in_path.cache_info().hits == 1
+    runez.delete("bin/foo", logger=None)
+    assert runez.which("foo") is None
+
+    # Misses are not cached, program is found (and cached again) once installed
+    assert runez.program._which_in_path.cache_info().currsize == 0
+    runez.write("bin/foo", "#!/bin/sh\n", logger=None)
+    runez.make_executable("bin/foo", logger=None)
+    assert runez.which("foo") == os.path.join(temp_folder, "bin", "foo")
+    assert runez.which("foo") == os.path.join(temp_folder, "bin", "foo")
+    assert runez.program._which_in_path.cache_info().currsize == 1
+
+    # Windows executable extensions are taken from PATHEXT
+    assert runez.program._windows_extensions(None) == (".com", ".exe", ".bat", ".cmd")
+    assert runez.program._windows_extensions(".EXE;.PS1;") == (".exe", ".ps1")
+
 
 @pytest.mark.skipif(runez.SYS_INFO.platform_id.is_windows, reason="Not supported on windows")
 def test_wrapped_run(monkeypatch):
@@ -174,13 +174,33 @@ def test_depot_folder(temp_folder):
     assert depot.find_python("8.5.6") is python
     assert str(depot.find_python("8.5.7")) == "8.5.7 [not available]"
 
-
-def test_depot_path(temp_folder):
+    # Repeated lookups are served from the memo, until location is re-scanned
+    location = depot.locations[0]
+    spec = PythonSpec.from_text("8.6")
+    assert location.find_python(spec) is None
+    assert spec in location._found_pythons
+    mk_python("8.6.1")
+    runez.symlink(".pyenv/versions/8.6.1/bin/python8.6", "python8.6", logger=None)
+    assert location.find_python(spec) is None
+    runez.cached_property.reset(location)
+    assert str(location.find_python(spec)) == "python8.6 [8.6.1]"
+    assert len(location._found_pythons) == 1
+    assert str(location.find_python(PythonSpec.from_text("8.5.6"))) == "python8.5 [8.5.6]"
+
+
+def test_depot_path(temp_folder, monkeypatch):
     depot = PythonDepot("PATH")
     assert depot.available_pythons
     assert depot.preferred_python is None
     assert depot.find_python(None) is depot.invoker
 
+    # Empty PATH entries are skipped, surrounding spaces are stripped
+    mk_python("8.6.1")
+    monkeypatch.setenv("PATH", "%s :: " % os.path.join(".pyenv", "versions", "8.6.1", "bin"))
+    depot = PythonDepot("PATH")
+    python = depot.find_python("8.6")
+    assert str(python.full_version) == "8.6.1"
+
 
 def test_empty_depot(temp_folder):
     depot = PythonDepot()
@@ -510,6 +530,21 @@ def test_version():
     assert invalid.ignored == ".dirty"
     assert loose > invalid
 
+    # Parsed info is shared between versions with the same text, parsing options still apply
+    assert Version("v1.0.dirty", canonical=None).components is loose.components
+    assert Version("1.2.3", max_parts=2).components is None
+    assert Version("1.2.3").components == (1, 2, 3, 0, 0, 0, "")
+
+    # Plain dotted versions take a shortcut, and must parse the same as when they go through the full PEP-440 regex
+    for text in ("0", "3", "3.11.5", "01.2", "1.2.3.4.5", "1.2.3.4.5.6"):
+        simple = Version(text)
+        full = Version("v%s" % text)
+        assert simple.text == full.text == text
+        assert simple.components == full.components
+        assert simple.given_components == full.given_components
+
+    assert not Version("3..5").is_valid
+
     dev101 = Version("0.0.1dev101")
     assert not dev101.is_final
     assert dev101.is_valid
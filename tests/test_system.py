@@ -98,6 +98,21 @@ def test_capped():
         runez.capped(132, maximum=100, key="testing")
 
 
+def test_capture_buffer():
+    buffer = runez.system.CaptureBuffer()
+    assert buffer.getvalue() == ""
+    assert not buffer.isatty()
+    assert buffer.write("foo") == 3
+    print("bar", file=buffer)
+    assert buffer.getvalue() == "foobar\n"
+    assert buffer.getvalue() == "foobar\n"
+    with pytest.raises(TypeError):
+        buffer.write(b"foo")
+
+    buffer.clear()
+    assert buffer.getvalue() == ""
+
+
 def test_capture_nested():
     with runez.CaptureOutput(stdout=True, stderr=True) as logged1:
         # Capture both stdout and stderr
@@ -173,6 +188,42 @@ def test_current_folder(temp_folder):
 
     assert os.getcwd() == temp_folder
 
+    with pytest.raises(OSError):
+        with runez.CurrentFolder("no-such-folder"):
+            pass
+
+    assert os.getcwd() == temp_folder
+    assert runez.ensure_folder("sample/inner") == 1
+    with runez.CurrentFolder("sample"):
+        with runez.CurrentFolder("inner"):
+            os.rename(sample, sample + "-renamed")
+
+        if os.chdir in os.supports_fd:
+            # Previous folder is restored even if it got renamed meanwhile
+            assert os.getcwd() == sample + "-renamed"
+
+    assert os.getcwd() == temp_folder
+
+    # Entering from an execute-only folder is fine
+    assert runez.ensure_folder("x-only") == 1
+    os.chmod("x-only", 0o100)
+    try:
+        os.chdir("x-only")
+        with runez.CurrentFolder(temp_folder):
+            assert os.getcwd() == temp_folder
+
+        assert os.getcwd() == os.path.join(temp_folder, "x-only")
+
+        with patch("runez.system.os.open", side_effect=PermissionError):
+            with runez.CurrentFolder(temp_folder):
+                assert os.getcwd() == temp_folder
+
+            assert os.getcwd() == os.path.join(temp_folder, "x-only")
+
+    finally:
+        os.chdir(temp_folder)
+        os.chmod("x-only", 0o700)
+
 
 def test_decode():
     assert runez.decode(None) is None
@@ -289,6 +340,15 @@ def test_flattened():
     assert runez.flattened(["foo", "-r", None, "bar"], shellify=True) == ["foo", "bar"]
     assert runez.flattened(["-r", None, "foo"], unique=True) == ["-r", "foo"]
     assert runez.flattened(["-r", None, "foo"], keep_empty=True, unique=True) == ["-r", None, "foo"]
+    assert runez.flattened(["-r", None, "-r", "foo"], shellify=True, unique=True) == ["-r", "foo"]
+
+    # Unhashable values, and nesting deeper than the recursion limit
+    assert runez.flattened([{"a": 1}, "b", {"a": 1}], unique=True) == [{"a": 1}, "b"]
+    deep = ["a"]
+    for _ in range(2000):
+        deep = [deep, "b"]
+
+    assert runez.flattened(deep, unique=True) == ["a", "b"]
 
     # Sanitized
     assert runez.flattened(("a", None, ["b", None]), unique=True) == ["a", "b"]
@@ -408,10 +468,24 @@ def test_joined():
     assert runez.joined(1, 2, stringify=lambda x: "foo") == "foo foo"
 
 
-def test_path_resolution(temp_folder):
+def test_path_resolution(monkeypatch, temp_folder):
     assert runez.resolved_path(None) is None
     assert runez.resolved_path("some-file") == os.path.join(temp_folder, "some-file")
     assert runez.resolved_path("some-file", base="bar") == os.path.join(temp_folder, "bar", "some-file")
+    assert runez.resolved_path("some-file", base=runez.to_path("/bar")) == "/bar/some-file"
+    assert runez.resolved_path("some-file", base="~/bar") == os.path.join(os.path.expanduser("~/bar"), "some-file")
+    with monkeypatch.context() as m:
+        # Cached resolution must still follow $HOME
+        m.setenv("HOME", "/some-home")
+        assert runez.resolved_path("some-file", base="~/bar") == "/some-home/bar/some-file"
+        assert runez.resolved_path("~/some-file") == "/some-home/some-file"
+
+    assert runez.resolved_path("/some-file", base="bar") == "/some-file"
+    with runez.CurrentFolder(runez.to_path("/")):
+        # Cached resolution must still follow the current working dir
+        assert runez.resolved_path("some-file") == "/some-file"
+
+    assert runez.resolved_path("some-file") == os.path.join(temp_folder, "some-file")
 
     assert runez.quoted(["ls", os.path.join(temp_folder, "some-file") + " bar", "-a", " foo "]) == 'ls "some-file bar" -a " foo "'
 
@@ -541,6 +615,7 @@ def test_shortening():
             assert runez.short("./foo") == "./foo"
             assert runez.short(runez.resolved_path("foo")) == "foo"
             assert runez.short(runez.resolved_path("./foo/bar")) == "bar"
+            assert runez.short("%s %s" % (current_path, runez.resolved_path("./foo/bar"))) == "some-folder/bar bar"
 
         assert not runez.Anchored._paths
 
@@ -192,9 +192,20 @@ def test_success(cli, monkeypatch):
     assert cli.match("EL+", regex=re.IGNORECASE)
 
     cli.expect_success("hello world", "hello", "el+", regex=True)
+    cli.expect_messages("hello", "hello world", "ello", "world", "!foo", "h...d")  # Overlapping plain messages are all found
+    with pytest.raises(AssertionError, match="Not seen in output: bar"):
+        cli.expect_messages("hello", "world", "bar")
+
+    with pytest.raises(AssertionError, match="Unexpected match in output: hello"):
+        cli.expect_messages("hello", "world", "!hello")
+
     m = cli.match("hello ...l")
     assert str(m) == "hello worl"
     assert cli.match("el+", regex=True).match == "ell"
+    m = cli.match("(w|x)or", regex=True)  # Groups in 'expected' don't interfere with reported context
+    assert (m.pre, m.match, m.post) == ("pytest hello ", "wor", "ld")
+    m = cli.match("lo.wo", regex=True)
+    assert (m.pre, m.match, m.post) == ("pytest hel", "lo wo", "rld")
     assert cli.match(re.compile("hel+o")).match == "hello"
     assert cli.match("h...")
     assert cli.match("h...", regex=True)
@@ -202,6 +213,14 @@ def test_success(cli, monkeypatch):
     assert not cli.match("Hello")
     assert cli.match("Hello", regex=re.IGNORECASE)
 
+    # Context stays on the same line as the match, unless '.' matches newlines as well
+    cli.run(["0", "some line\nnext: wor ld\nthird"])
+    assert not cli.match("line.next", regex=True)
+    m = cli.match("line.next", regex=re.DOTALL)
+    assert (m.pre, m.match, m.post) == ("some ", "line\nnext", ": wor ld\nthird\n")
+    m = cli.match("^next", regex=re.MULTILINE)
+    assert (m.pre, m.match, m.post) == ("", "next", ": wor ld")
+
     cli.run([""])
     assert cli.succeeded
     assert cli.logged.stdout.contents().strip() == os.path.basename(sys.argv[0])